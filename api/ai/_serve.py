@@ -0,0 +1,9 @@
+# Standalone serving for the handlers outside Vercel, which imports
+# each handler class itself and never runs this
+from http.server import ThreadingHTTPServer
+import os
+
+def serve(handler):
+    # One daemon thread per request so concurrent calls don't queue
+    # behind each other
+    ThreadingHTTPServer(('', int(os.getenv('PORT', '8000'))), handler).serve_forever()
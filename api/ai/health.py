@@ -1,5 +1,5 @@
 from http.server import BaseHTTPRequestHandler
-import json
+import orjson
 
 class handler(BaseHTTPRequestHandler):
     def do_GET(self):
@@ -9,4 +9,8 @@ class handler(BaseHTTPRequestHandler):
         self.end_headers()
         
         response = {"status": "healthy", "service": "SIP AI Engine"}
-        self.wfile.write(json.dumps(response).encode())
+        self.wfile.write(orjson.dumps(response))
+
+if __name__ == '__main__':
+    from _serve import serve
+    serve(handler)
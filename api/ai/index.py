@@ -1,22 +1,32 @@
 from http.server import BaseHTTPRequestHandler
-import json
+import orjson
+
+# Service info never changes between deploys, so it is serialized once
+# and left to the edge cache
+SERVICE_INFO = orjson.dumps({
+    "service": "SIP AI Engine",
+    "status": "running",
+    "version": "1.0.0",
+    "endpoints": [
+        "GET /api/ai - Service info",
+        "GET /api/ai/health - Health check",
+        "POST /api/ai/match - Skill matching",
+        "POST /api/ai/match/batch - Batch skill matching",
+        "POST /api/ai/recommendations - Get recommendations"
+    ]
+})
 
 class handler(BaseHTTPRequestHandler):
     def do_GET(self):
         self.send_response(200)
         self.send_header('Content-type', 'application/json')
+        self.send_header('Content-Length', str(len(SERVICE_INFO)))
+        self.send_header('Cache-Control', 'public, max-age=3600, s-maxage=86400')
         self.send_header('Access-Control-Allow-Origin', '*')
         self.end_headers()
         
-        response = {
-            "service": "SIP AI Engine",
-            "status": "running",
-            "version": "1.0.0",
-            "endpoints": [
-                "GET /api/ai - Service info",
-                "GET /api/ai/health - Health check",
-                "POST /api/ai/match - Skill matching",
-                "POST /api/ai/recommendations - Get recommendations"
-            ]
-        }
-        self.wfile.write(json.dumps(response).encode())
+        self.wfile.write(SERVICE_INFO)
+
+if __name__ == '__main__':
+    from _serve import serve
+    serve(handler)
@@ -1,5 +1,13 @@
 from http.server import BaseHTTPRequestHandler
-import json
+import os
+import sys
+import traceback
+import orjson
+
+# Vercel loads handlers by file path from the project root, so the
+# handler directory is not on sys.path for sibling imports
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from _skills import match_skills, match_skills_batch
 
 class handler(BaseHTTPRequestHandler):
     def do_POST(self):
@@ -7,44 +15,27 @@ class handler(BaseHTTPRequestHandler):
         body = self.rfile.read(content_length)
         
         try:
-            data = json.loads(body) if body else {}
+            data = orjson.loads(body) if body else {}
         except:
             data = {}
         
-        self.send_response(200)
+        # Run the match before the status line goes out so failures map to 5xx
+        status = 200
+        try:
+            if self.path.split('?', 1)[0].rstrip('/').endswith('/batch'):
+                response = match_skills_batch(data)
+            else:
+                response = match_skills(data)
+        except Exception:
+            traceback.print_exc()
+            status, response = 500, {"error": "Internal server error"}
+        
+        self.send_response(status)
         self.send_header('Content-type', 'application/json')
         self.send_header('Access-Control-Allow-Origin', '*')
         self.end_headers()
         
-        student_skills = set(s.lower() for s in data.get('student_skills', []))
-        internship_skills = set(s.lower() for s in data.get('internship_skills', []))
-        
-        matched = student_skills & internship_skills
-        skill_gaps = internship_skills - student_skills
-        
-        if len(internship_skills) == 0:
-            match_score = 0.0
-        else:
-            match_score = len(matched) / len(internship_skills)
-        
-        recommendations = []
-        if len(skill_gaps) > 0:
-            recommendations.append(f"Consider learning: {', '.join(list(skill_gaps)[:3])}")
-        if match_score > 0.7:
-            recommendations.append("Strong match! Apply with confidence.")
-        elif match_score > 0.5:
-            recommendations.append("Good match. Highlight your transferable skills.")
-        else:
-            recommendations.append("Focus on building required skills first.")
-        
-        response = {
-            "match_score": round(match_score, 2),
-            "matched_skills": list(matched),
-            "skill_gaps": list(skill_gaps),
-            "recommendations": recommendations
-        }
-        
-        self.wfile.write(json.dumps(response).encode())
+        self.wfile.write(orjson.dumps(response))
 
     def do_OPTIONS(self):
         self.send_response(200)
@@ -52,3 +43,7 @@ class handler(BaseHTTPRequestHandler):
         self.send_header('Access-Control-Allow-Methods', 'POST, OPTIONS')
         self.send_header('Access-Control-Allow-Headers', 'Content-Type, Authorization')
         self.end_headers()
+
+if __name__ == '__main__':
+    from _serve import serve
+    serve(handler)
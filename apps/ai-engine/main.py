@@ -1,12 +1,81 @@
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
-from typing import List, Optional
+from typing import List, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+import asyncio
+import functools
+import hashlib
+import json
+import logging
 import os
+import pickle
+import numpy as np
 from dotenv import load_dotenv
+import httpx
+from openai import AsyncOpenAI
+import faiss
+import psycopg2
+from psycopg2.pool import ThreadedConnectionPool
+import skills
+from vector_index import DenseIndex, Int8Index, IVFPQIndex, PQIndex, encode_vectors, search_batch
 
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
+EMBEDDING_MODEL = os.getenv("EMBEDDING_MODEL", "text-embedding-3-small")
+# Fixed by the vector(1536) pgvector column; text-embedding-3 models are
+# asked for this size, older models must already produce it
+EMBEDDING_DIM = 1536
+EMBEDDING_CACHE_DIR = os.getenv(
+    "EMBEDDING_CACHE_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "embeddings")
+)
+# OpenAI rejects embedding requests with more inputs than this
+EMBEDDING_BATCH_LIMIT = 2048
+
+# Created at startup on the worker's shared HTTP/2 client
+openai_client: Optional[AsyncOpenAI] = None
+
+DATABASE_URL = os.getenv("DATABASE_URL")
+RECOMMENDATION_LIMIT = 20
+
+# Every uvicorn worker opens its own pool and loads its own catalog index,
+# so keep WEB_CONCURRENCY * DB_POOL_SIZE under Postgres's max_connections
+WEB_CONCURRENCY = int(os.getenv("WEB_CONCURRENCY", "2"))
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", str(max(2, 40 // WEB_CONCURRENCY))))
+
+# Whitelisted recommendation preferences and the SQL filter each one adds
+PREFERENCE_FILTERS = {
+    "type": "type::text = %s",
+    "location": "lower(location) = lower(%s)",
+    "min_stipend": "stipend >= %s",
+    "max_duration": "duration <= %s",
+}
+
+# In-memory catalog index used to shortlist recommendation candidates
+# before the exact re-rank in Postgres:
+#   hnsw  - no in-memory index, query the pgvector HNSW index directly
+#   pq    - product-quantized codes, needs the codebook at PQ_CODEBOOK_PATH
+#   dense - exact scan of FP32 vectors, for catalogs up to ~100K
+#   int8  - scan of int8-quantized vectors, a quarter of dense's memory
+#   ivfpq - faiss IVF-PQ trained at IVFPQ_INDEX_PATH, on the GPU when present
+PQ_CODEBOOK_PATH = os.getenv("PQ_CODEBOOK_PATH")
+IVFPQ_INDEX_PATH = os.getenv("IVFPQ_INDEX_PATH")
+RECOMMENDATION_INDEX = os.getenv("RECOMMENDATION_INDEX", "pq" if PQ_CODEBOOK_PATH else "hnsw")
+RERANK_CANDIDATES = 100
+# An upsert only reaches the worker that served it; every worker pulls
+# embeddings changed elsewhere on this interval, in seconds
+CATALOG_SYNC_INTERVAL = float(os.getenv("CATALOG_SYNC_INTERVAL", "60"))
+
+db_pool: Optional[ThreadedConnectionPool] = None
+catalog_index = None
+catalog_synced_at = None
+catalog_sync_task: Optional[asyncio.Task] = None
+
 app = FastAPI(
     title="SIP AI Engine",
     description="AI-powered matching and recommendations for SIP",
@@ -33,6 +102,18 @@ class SkillMatchResponse(BaseModel):
     skill_gaps: List[str]
     recommendations: List[str]
 
+class InternshipSkills(BaseModel):
+    id: str
+    skills: List[str]
+
+class BatchSkillMatchRequest(BaseModel):
+    student_skills: List[str]
+    internships: List[InternshipSkills]
+
+class BatchSkillMatchResult(BaseModel):
+    internship_id: str
+    match_score: float
+
 class InternshipRecommendationRequest(BaseModel):
     student_id: str
     student_skills: List[str]
@@ -43,6 +124,437 @@ class InternshipRecommendation(BaseModel):
     match_score: float
     reasoning: str
 
+# Helpers
+def embedding_array(vector) -> np.ndarray:
+    # Embeddings travel as read-only float32 arrays (6KB for 1536
+    # dimensions, against ~49KB as a tuple of floats) so memoized
+    # vectors can be shared without being modified
+    vector = np.array(vector, dtype=np.float32)
+    vector.setflags(write=False)
+    return vector
+
+def local_embedding(text: str) -> np.ndarray:
+    """
+    Deterministic unit vector seeded from the text hash.
+    Stand-in for a local model when no OpenAI key is configured; it
+    carries no meaning, so it is never cached to disk or indexed.
+    """
+    seed = int.from_bytes(hashlib.sha256(text.encode()).digest()[:8], "little")
+    vector = np.random.default_rng(seed).standard_normal(EMBEDDING_DIM)
+    return embedding_array(vector / np.linalg.norm(vector))
+
+async def provider_embeddings(texts: List[str]) -> List[np.ndarray]:
+    """
+    Embed a batch of texts in as few provider calls as the provider's
+    per-request input limit allows.
+    """
+    if openai_client is None:
+        return [local_embedding(text) for text in texts]
+    # openai 1.7 predates the dimensions argument, so it goes in the body
+    extra_body = {"dimensions": EMBEDDING_DIM} if EMBEDDING_MODEL.startswith("text-embedding-3") else None
+    vectors = []
+    for start in range(0, len(texts), EMBEDDING_BATCH_LIMIT):
+        response = await openai_client.embeddings.create(
+            input=texts[start:start + EMBEDDING_BATCH_LIMIT], model=EMBEDDING_MODEL, extra_body=extra_body
+        )
+        vectors.extend(embedding_array(item.embedding) for item in sorted(response.data, key=lambda item: item.index))
+    return vectors
+
+class MicroBatcher:
+    """
+    Collects single requests arriving within a short window on an
+    asyncio.Queue and passes them to handler as one batch; handler
+    returns one result per item, in order.
+    """
+
+    def __init__(self, handler, window: float = 0.01, max_batch: int = 256):
+        self.handler = handler
+        self.window = window
+        self.max_batch = max_batch
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self.queue: Optional[asyncio.Queue] = None
+        self.task: Optional[asyncio.Task] = None
+        self.flushes = set()
+
+    def start(self):
+        self.loop = asyncio.get_running_loop()
+        self.queue = asyncio.Queue()
+        self.task = self.loop.create_task(self.run())
+
+    async def stop(self):
+        if self.task is not None:
+            self.task.cancel()
+            try:
+                await self.task
+            except asyncio.CancelledError:
+                pass
+        self.loop = self.queue = self.task = None
+
+    async def submit(self, item):
+        future = self.loop.create_future()
+        await self.queue.put((item, future))
+        return await future
+
+    def run_threadsafe(self, coro):
+        # Blocks the calling worker thread until coro finishes on the event
+        # loop, or runs it on a fresh loop when the batcher is not started
+        if self.loop is None:
+            return asyncio.run(coro)
+        try:
+            running_loop = asyncio.get_running_loop()
+        except RuntimeError:
+            running_loop = None
+        if running_loop is self.loop:
+            coro.close()
+            raise RuntimeError("Batched calls must be made from a worker thread, not the event loop")
+        return asyncio.run_coroutine_threadsafe(coro, self.loop).result()
+
+    def submit_threadsafe(self, item):
+        if self.loop is None:
+            return self.run_threadsafe(self.handler([item]))[0]
+        return self.run_threadsafe(self.submit(item))
+
+    async def run(self):
+        while True:
+            batch = [await self.queue.get()]
+            deadline = self.loop.time() + self.window
+            while len(batch) < self.max_batch:
+                timeout = deadline - self.loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self.queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            flush = self.loop.create_task(self.flush(batch))
+            self.flushes.add(flush)
+            flush.add_done_callback(self.flushes.discard)
+
+    async def flush(self, batch: List[Tuple[object, asyncio.Future]]):
+        try:
+            results = await self.handler([item for item, _ in batch])
+        except Exception as exc:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(exc)
+            return
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+
+embedding_batcher = MicroBatcher(provider_embeddings)
+
+def embedding_cache_path(text: str) -> str:
+    # Only provider vectors are cached, keyed on the provider and model
+    key = hashlib.sha256(f"openai:{EMBEDDING_MODEL}:{text}".encode()).hexdigest()[:16]
+    return os.path.join(EMBEDDING_CACHE_DIR, f"{key}.pkl")
+
+def load_cached_embedding(text: str) -> Optional[np.ndarray]:
+    try:
+        with open(embedding_cache_path(text), "rb") as f:
+            cached_text, vector = pickle.load(f)
+    except (OSError, EOFError, pickle.UnpicklingError, ValueError):
+        return None
+    # Entries written before the switch to arrays hold tuples
+    return embedding_array(vector) if cached_text == text else None
+
+def store_cached_embedding(text: str, vector: np.ndarray):
+    path = embedding_cache_path(text)
+    os.makedirs(EMBEDDING_CACHE_DIR, exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        pickle.dump((text, vector), f)
+    os.replace(tmp_path, path)
+
+@functools.lru_cache(maxsize=4096)
+def provider_embedding(text: str) -> np.ndarray:
+    vector = load_cached_embedding(text)
+    if vector is None:
+        vector = embedding_batcher.submit_threadsafe(text)
+        store_cached_embedding(text, vector)
+    return vector
+
+def embed_text(text: str) -> np.ndarray:
+    """
+    Embed text, memoized in process and persisted to disk so warm
+    starts skip the provider round-trip. Misses are micro-batched
+    with concurrent requests.
+    """
+    # Checked before the memoized call so fallback vectors never fill it
+    if openai_client is None:
+        return local_embedding(text)
+    return provider_embedding(text)
+
+def embed_texts(texts: List[str]) -> List[np.ndarray]:
+    """
+    Embed many texts, sending every disk-cache miss in one provider call.
+    """
+    if openai_client is None:
+        return [local_embedding(text) for text in texts]
+    missing = [text for text in dict.fromkeys(texts) if load_cached_embedding(text) is None]
+    if missing:
+        vectors = embedding_batcher.run_threadsafe(provider_embeddings(missing))
+        for text, vector in zip(missing, vectors):
+            store_cached_embedding(text, vector)
+    return [embed_text(text) for text in texts]
+
+def libpq_dsn(url: str) -> str:
+    # Prisma-style URLs carry ?schema=..., which libpq rejects
+    parts = urlsplit(url)
+    query = [(key, value) for key, value in parse_qsl(parts.query) if key != "schema"]
+    return urlunsplit(parts._replace(query=urlencode(query)))
+
+@contextmanager
+def db_connection():
+    conn = db_pool.getconn()
+    try:
+        with conn:
+            yield conn
+    finally:
+        db_pool.putconn(conn)
+
+def vector_literal(vector: np.ndarray) -> str:
+    return "[" + ",".join(map(repr, vector.tolist())) + "]"
+
+def query_similar_internships(
+    embedding: np.ndarray,
+    preferences: dict,
+    limit: int,
+    candidate_ids: Optional[List[str]] = None
+) -> List[Tuple[str, List[str], float]]:
+    """
+    Nearest published internships by cosine distance, served by the
+    HNSW index on internships.embedding. With candidate_ids, re-ranks
+    just those internships exactly on their FP32 embeddings instead.
+    """
+    vector = vector_literal(embedding)
+    clauses = ["embedding IS NOT NULL", "status = 'PUBLISHED'"]
+    params = [vector]
+    for key, clause in PREFERENCE_FILTERS.items():
+        if preferences.get(key) is not None:
+            clauses.append(clause)
+            params.append(preferences[key])
+
+    if candidate_ids is None:
+        order_by = "embedding <=> %s::vector"
+        params.append(vector)
+    else:
+        # Ordering by the computed score keeps the planner off the HNSW index
+        clauses.append("id = ANY(%s)")
+        params.append(candidate_ids)
+        order_by = "score DESC"
+    params.append(limit)
+
+    sql = (
+        "SELECT id, required_skills, 1 - (embedding <=> %s::vector) AS score "
+        f"FROM internships WHERE {' AND '.join(clauses)} "
+        f"ORDER BY {order_by} LIMIT %s"
+    )
+    with db_connection() as conn, conn.cursor() as cur:
+        if candidate_ids is None:
+            # HNSW applies the WHERE clause after its ef_search-wide scan, so
+            # a selective filter could return fewer than limit rows; pgvector
+            # 0.8 keeps scanning in distance order until limit rows pass
+            cur.execute("SET LOCAL hnsw.iterative_scan = strict_order")
+        cur.execute(sql, params)
+        return cur.fetchall()
+
+# Searches run on one dedicated thread so concurrent queries queue up as
+# a single (B, d) matrix instead of contending for the index
+search_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="catalog-search")
+
+async def search_catalog(queries: List[np.ndarray]) -> List[List[str]]:
+    results = await asyncio.get_running_loop().run_in_executor(
+        search_executor, search_batch, catalog_index, np.stack(queries), RERANK_CANDIDATES
+    )
+    return [ids for ids, _ in results]
+
+search_batcher = MicroBatcher(search_catalog, window=0.002, max_batch=64)
+
+def rerank_internships(
+    embedding: np.ndarray, preferences: dict, limit: int
+) -> List[Tuple[str, List[str], float]]:
+    """
+    Shortlist candidates from the in-memory catalog index, then re-rank
+    the shortlist on the FP32 vectors with preference filters applied.
+    """
+    if isinstance(catalog_index, IVFPQIndex):
+        candidate_ids = search_batcher.submit_threadsafe(embedding)
+    else:
+        candidate_ids, _ = catalog_index.search(embedding, RERANK_CANDIDATES)
+    rows = query_similar_internships(embedding, preferences, limit, candidate_ids) if candidate_ids else []
+    # The shortlist ignores preferences, so a selective filter can leave
+    # it short; the filtered HNSW query then finds the matches it missed
+    if len(rows) < limit and any(preferences.get(key) is not None for key in PREFERENCE_FILTERS):
+        return query_similar_internships(embedding, preferences, limit)
+    return rows
+
+def load_pq_index(codebook_path: str) -> PQIndex:
+    pq = faiss.read_ProductQuantizer(codebook_path)
+    with db_connection() as conn, conn.cursor() as cur:
+        cur.execute(
+            "SELECT id, embedding_pq FROM internships "
+            "WHERE status = 'PUBLISHED' AND embedding_pq IS NOT NULL"
+        )
+        rows = cur.fetchall()
+    codes = np.frombuffer(b"".join(bytes(code) for _, code in rows), dtype=np.uint8)
+    return PQIndex(pq, [internship_id for internship_id, _ in rows], codes)
+
+def fetch_published_embeddings(updated_since=None, ids=()) -> Tuple[List[str], np.ndarray]:
+    """
+    Published embeddings, optionally only those stored after updated_since
+    plus the given ids. embedding_updated_at only moves when an embedding
+    is stored, unlike updated_at which every view count bump touches.
+    """
+    sql = (
+        "SELECT id, embedding::text FROM internships "
+        "WHERE status = 'PUBLISHED' AND embedding IS NOT NULL"
+    )
+    params = []
+    if updated_since is not None:
+        sql += " AND (embedding_updated_at > %s OR id = ANY(%s))"
+        params.extend([updated_since, list(ids)])
+    with db_connection() as conn, conn.cursor() as cur:
+        cur.execute(sql, params)
+        rows = cur.fetchall()
+    vectors = np.array([json.loads(vector) for _, vector in rows], dtype=np.float32)
+    return [internship_id for internship_id, _ in rows], vectors.reshape(len(rows), EMBEDDING_DIM)
+
+def fetch_published_ids() -> set:
+    with db_connection() as conn, conn.cursor() as cur:
+        cur.execute("SELECT id FROM internships WHERE status = 'PUBLISHED' AND embedding IS NOT NULL")
+        return {internship_id for internship_id, in cur.fetchall()}
+
+def database_now():
+    with db_connection() as conn, conn.cursor() as cur:
+        cur.execute("SELECT now()")
+        return cur.fetchone()[0]
+
+def sync_catalog_index():
+    """
+    Drop internships that are no longer published and upsert embeddings
+    other workers stored since the last sync, along with any published
+    internship the index is missing.
+    """
+    global catalog_synced_at
+    synced_at = database_now()
+    published = fetch_published_ids()
+    indexed = catalog_index.id_set()
+    catalog_index.remove(indexed - published)
+    ids, vectors = fetch_published_embeddings(catalog_synced_at, published - indexed)
+    for internship_id, vector in zip(ids, vectors):
+        catalog_index.upsert(internship_id, vector)
+    catalog_synced_at = synced_at
+
+async def run_catalog_sync():
+    while True:
+        await asyncio.sleep(CATALOG_SYNC_INTERVAL)
+        try:
+            await asyncio.to_thread(sync_catalog_index)
+        except psycopg2.Error:
+            logger.warning("Could not sync the catalog index", exc_info=True)
+
+def load_ivfpq_index(index_path: str) -> IVFPQIndex:
+    return IVFPQIndex(faiss.read_index(index_path), *fetch_published_embeddings())
+
+def store_internship_embedding(internship_id: str) -> bool:
+    with db_connection() as conn, conn.cursor() as cur:
+        cur.execute(
+            "SELECT title, description, required_skills, preferred_skills "
+            "FROM internships WHERE id = %s",
+            [internship_id]
+        )
+        row = cur.fetchone()
+    if row is None:
+        return False
+    title, description, required_skills, preferred_skills = row
+    text = f"{title}\n{description}\nSkills: {', '.join(required_skills + preferred_skills)}"
+    # The provider round-trip runs with the connection back in the pool
+    embedding = embed_text(text)
+
+    with db_connection() as conn, conn.cursor() as cur:
+        cur.execute(
+            "UPDATE internships SET embedding = %s::vector, embedding_updated_at = now(), "
+            "updated_at = now() WHERE id = %s",
+            [vector_literal(embedding), internship_id]
+        )
+        if isinstance(catalog_index, PQIndex):
+            code = encode_vectors(catalog_index.pq, embedding.reshape(1, -1))[0]
+            cur.execute(
+                "UPDATE internships SET embedding_pq = %s WHERE id = %s",
+                [code.tobytes(), internship_id]
+            )
+    if catalog_index is not None:
+        catalog_index.upsert(internship_id, embedding)
+    return True
+
+def recommendation_reasoning(student_skills: List[str], required_skills: List[str]) -> str:
+    extra_ids = {}
+    matched_mask = skills.skill_mask(student_skills, extra_ids) & skills.skill_mask(required_skills, extra_ids)
+    matched = skills.skill_names(matched_mask, extra_ids)
+    if matched:
+        return f"Strong match based on {', '.join(matched[:3])} skills"
+    return "Similar to your skill profile"
+
+# Lifecycle
+@app.on_event("startup")
+async def open_http_client():
+    global openai_client
+    # One HTTP/2 client per worker: provider calls share its TLS
+    # connections and multiplex over them instead of reconnecting
+    app.state.http = httpx.AsyncClient(
+        http2=True,
+        timeout=30,
+        limits=httpx.Limits(max_connections=100, max_keepalive_connections=50)
+    )
+    if os.getenv("OPENAI_API_KEY"):
+        openai_client = AsyncOpenAI(http_client=app.state.http)
+
+@app.on_event("shutdown")
+async def close_http_client():
+    global openai_client
+    openai_client = None
+    await app.state.http.aclose()
+
+@app.on_event("startup")
+async def open_db_pool():
+    global db_pool, catalog_index, catalog_synced_at, catalog_sync_task
+    if not DATABASE_URL:
+        return
+    # minconn=0 so the engine still starts when the database is down
+    db_pool = ThreadedConnectionPool(0, DB_POOL_SIZE, dsn=libpq_dsn(DATABASE_URL))
+    try:
+        catalog_synced_at = await asyncio.to_thread(database_now)
+        if RECOMMENDATION_INDEX == "pq" and PQ_CODEBOOK_PATH and os.path.exists(PQ_CODEBOOK_PATH):
+            catalog_index = await asyncio.to_thread(load_pq_index, PQ_CODEBOOK_PATH)
+        elif RECOMMENDATION_INDEX == "dense":
+            catalog_index = DenseIndex(*await asyncio.to_thread(fetch_published_embeddings))
+        elif RECOMMENDATION_INDEX == "int8":
+            catalog_index = Int8Index(*await asyncio.to_thread(fetch_published_embeddings))
+        elif RECOMMENDATION_INDEX == "ivfpq" and IVFPQ_INDEX_PATH and os.path.exists(IVFPQ_INDEX_PATH):
+            catalog_index = await asyncio.to_thread(load_ivfpq_index, IVFPQ_INDEX_PATH)
+    except psycopg2.Error:
+        logger.warning("Could not load the catalog index, using the HNSW index only", exc_info=True)
+    if catalog_index is not None:
+        catalog_sync_task = asyncio.get_running_loop().create_task(run_catalog_sync())
+
+@app.on_event("shutdown")
+async def close_db_pool():
+    if catalog_sync_task is not None:
+        catalog_sync_task.cancel()
+    if db_pool is not None:
+        db_pool.closeall()
+
+@app.on_event("startup")
+async def start_batchers():
+    embedding_batcher.start()
+    search_batcher.start()
+
+@app.on_event("shutdown")
+async def stop_batchers():
+    await embedding_batcher.stop()
+    await search_batcher.stop()
+
 # Routes
 @app.get("/")
 def read_root():
@@ -56,42 +568,20 @@ def read_root():
 def health_check():
     return {"status": "healthy"}
 
-@app:post("/api/v1/match/skills")
-async def match_skills(request: SkillMatchRequest) -> SkillMatchResponse:
+@app.post("/api/v1/match/skills")
+def match_skills(request: SkillMatchRequest) -> SkillMatchResponse:
     """
     Calculate skill match score between student and internship requirements.
     Uses cosine similarity and embeddings for semantic matching.
     """
-    student_skills = set(s.lower() for s in request.student_skills)
-    internship_skills = set(s.lower() for s in request.internship_skills)
-    
-    # Exact matches
-    matched = student_skills & internship_skills
-    skill_gaps = internship_skills - student_skills
-    
-    # Calculate match score
-    if len(internship_skills) == 0:
-        match_score = 0.0
-    else:
-        match_score = len(matched) / len(internship_skills)
-    
-    # Generate recommendations
-    recommendations = []
-    if len(skill_gaps) > 0:
-        recommendations.append(f"Consider learning: {', '.join(list(skill_gaps)[:3])}")
-    if match_score > 0.7:
-        recommendations.append("Strong match! Apply with confidence.")
-    elif match_score > 0.5:
-        recommendations.append("Good match. Highlight your transferable skills.")
-    else:
-        recommendations.append("Focus on building required skills first.")
-    
-    return SkillMatchResponse(
-        match_score=round(match_score, 2),
-        matched_skills=list(matched),
-        skill_gaps=list(skill_gaps),
-        recommendations=recommendations
-    )
+    return SkillMatchResponse(**skills.match_skills(request.model_dump()))
+
+@app.post("/api/v1/match/skills/batch")
+def match_skills_batch(request: BatchSkillMatchRequest) -> List[BatchSkillMatchResult]:
+    """
+    Score a student's skills against a batch of internships in one call.
+    """
+    return [BatchSkillMatchResult(**result) for result in skills.match_skills_batch(request.model_dump())]
 
 @app.post("/api/v1/recommendations")
 async def get_recommendations(
@@ -101,13 +591,28 @@ async def get_recommendations(
     Get personalized internship recommendations for a student.
     Uses vector embeddings and RAG for intelligent matching.
     """
-    # In production, this would:
-    # 1. Get student embedding from DB
-    # 2. Query pgvector for similar internships
-    # 3. Use LLM to generate reasoning
-    # 4. Return ranked results
+    # Fallback vectors would rank the catalog at random, so real
+    # recommendations need both the database and the embedding provider
+    if db_pool is not None and openai_client is not None:
+        student_embedding = await asyncio.to_thread(
+            embed_text, f"Skills: {', '.join(request.student_skills)}"
+        )
+        rows = await asyncio.to_thread(
+            query_similar_internships if catalog_index is None else rerank_internships,
+            student_embedding,
+            request.preferences or {},
+            RECOMMENDATION_LIMIT
+        )
+        return [
+            InternshipRecommendation(
+                internship_id=internship_id,
+                match_score=round(score, 2),
+                reasoning=recommendation_reasoning(request.student_skills, required_skills)
+            )
+            for internship_id, required_skills, score in rows
+        ]
     
-    # Mock response for now
+    # Mock response when no database or embedding provider is configured
     return [
         InternshipRecommendation(
             internship_id="mock-id-1",
@@ -127,13 +632,40 @@ async def generate_embeddings(text: str):
     Generate embeddings for text using OpenAI or local model.
     Stores in pgvector for similarity search.
     """
-    # In production: Use OpenAI embeddings API or local model
+    embedding = await asyncio.to_thread(embed_text, text)
     return {
         "text": text,
-        "embedding_length": 1536,
+        "embedding_length": len(embedding),
         "status": "generated"
     }
 
+@app.post("/api/v1/embeddings/generate_batch")
+async def generate_embeddings_batch(texts: List[str]):
+    """
+    Generate embeddings for many texts with a single provider call.
+    Vectors are returned in the same order as the input texts.
+    """
+    embeddings = await asyncio.to_thread(embed_texts, texts)
+    return {
+        "embeddings": [embedding.tolist() for embedding in embeddings],
+        "embedding_length": EMBEDDING_DIM,
+        "status": "generated"
+    }
+
+@app.post("/api/v1/internships/{internship_id}/embedding")
+async def index_internship(internship_id: str):
+    """
+    Embed an internship's title, description and skills into pgvector
+    so it can be served by recommendations.
+    """
+    if db_pool is None:
+        raise HTTPException(status_code=503, detail="Database not configured")
+    if openai_client is None:
+        raise HTTPException(status_code=503, detail="Embedding provider not configured")
+    if not await asyncio.to_thread(store_internship_embedding, internship_id):
+        raise HTTPException(status_code=404, detail="Internship not found")
+    return {"internship_id": internship_id, "status": "indexed"}
+
 @app.post("/api/v1/analyze/resume")
 async def analyze_resume(resume_text: str):
     """
@@ -150,4 +682,12 @@ async def analyze_resume(resume_text: str):
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    # The default "auto" loop and http pick uvloop and httptools wherever
+    # uvicorn[standard] installs them (not on Windows);
+    # WEB_CONCURRENCY sets the number of worker processes
+    uvicorn.run(
+        "main:app",
+        host="0.0.0.0",
+        port=int(os.getenv("PORT", "8000")),
+        workers=WEB_CONCURRENCY
+    )
@@ -0,0 +1,73 @@
+import importlib.util
+import json
+import os
+import subprocess
+import sys
+import threading
+import urllib.error
+import urllib.request
+from http.server import ThreadingHTTPServer
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+WEB_APP = os.path.join(ROOT, "apps", "web-app")
+
+# Mirrors the Vercel Python runtime: the entrypoint is loaded by file path
+# with the deploy root as the working directory, not the handler's folder
+LOADER = """
+import importlib.util, sys
+spec = importlib.util.spec_from_file_location("vc__handler", sys.argv[1])
+module = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(module)
+assert isinstance(module.handler, type)
+"""
+
+HANDLERS = [
+    (deploy_root, os.path.join(".", "api", "ai", name))
+    for deploy_root in (ROOT, WEB_APP)
+    for name in ("health.py", "index.py", "match.py", "recommendations.py")
+]
+
+@pytest.mark.parametrize("deploy_root,entrypoint", HANDLERS)
+def test_handler_loads_from_deploy_root(deploy_root, entrypoint):
+    result = subprocess.run(
+        [sys.executable, "-c", LOADER, entrypoint],
+        cwd=deploy_root, capture_output=True, text=True, timeout=60
+    )
+    assert result.returncode == 0, result.stderr
+
+def test_serve_helpers_match():
+    copies = []
+    for deploy_root in (ROOT, WEB_APP):
+        with open(os.path.join(deploy_root, "api", "ai", "_serve.py")) as f:
+            copies.append(f.read())
+    assert copies[0] == copies[1]
+
+def serve_handler(path):
+    spec = importlib.util.spec_from_file_location("match_handler", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    server = ThreadingHTTPServer(("127.0.0.1", 0), module.handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+def post(server, path, payload):
+    request = urllib.request.Request(
+        f"http://127.0.0.1:{server.server_port}{path}", data=json.dumps(payload).encode()
+    )
+    try:
+        with urllib.request.urlopen(request, timeout=10) as response:
+            return response.status, json.loads(response.read())
+    except urllib.error.HTTPError as error:
+        return error.code, json.loads(error.read())
+
+@pytest.mark.parametrize("deploy_root", [ROOT, WEB_APP])
+def test_match_handler_maps_failures_to_500(deploy_root):
+    server = serve_handler(os.path.join(deploy_root, "api", "ai", "match.py"))
+    try:
+        status, body = post(server, "/api/ai/match", {"student_skills": ["a"], "internship_skills": ["a", "b"]})
+        assert status == 200 and body["match_score"] == 0.5
+        status, body = post(server, "/api/ai/match", {"student_skills": 5})
+        assert status == 500 and body == {"error": "Internal server error"}
+    finally:
+        server.shutdown()
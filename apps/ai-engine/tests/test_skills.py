@@ -0,0 +1,123 @@
+import importlib.util
+import os
+import random
+import pytest
+import skills
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+def load_sync():
+    path = os.path.join(ROOT, "libs", "skill-matching", "sync.py")
+    spec = importlib.util.spec_from_file_location("skill_matching_sync", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+def test_copies_match_source():
+    sync = load_sync()
+    with open(sync.SOURCE) as f:
+        source = f.read()
+    assert sync.stale_copies(source) == [], "run python libs/skill-matching/sync.py"
+
+
+def legacy_match(student_skills, internship_skills):
+    # Set-based implementation the bitmask matcher replaced
+    student = set(s.lower() for s in student_skills)
+    internship = set(s.lower() for s in internship_skills)
+    matched = student & internship
+    gaps = internship - student
+    score = len(matched) / len(internship) if internship else 0.0
+    return matched, gaps, score
+
+def random_skills(rng, n):
+    pool = list(skills.SKILL_NAMES[:12]) + ["Cobol", "Haskell", "Elixir"]
+    return [rng.choice([name, name.upper(), name.title()]) for name in rng.sample(pool, n)]
+
+@pytest.mark.parametrize("seed", range(200))
+def test_match_skills_matches_set_semantics(seed):
+    rng = random.Random(seed)
+    student = random_skills(rng, rng.randint(0, 8))
+    internship = random_skills(rng, rng.randint(0, 8))
+    result = skills.match_skills({"student_skills": student, "internship_skills": internship})
+    matched, gaps, score = legacy_match(student, internship)
+
+    assert set(result["matched_skills"]) == matched
+    assert len(result["matched_skills"]) == len(matched)
+    assert set(result["skill_gaps"]) == gaps
+    assert len(result["skill_gaps"]) == len(gaps)
+    # Integer half-up rounding may differ from round() by a cent on exact ties such as 1/8
+    assert abs(result["match_score"] - round(score, 2)) <= 0.01 + 1e-9
+
+    tier = result["recommendations"][-1]
+    if score > 0.7:
+        assert tier == "Strong match! Apply with confidence."
+    elif score > 0.5:
+        assert tier == "Good match. Highlight your transferable skills."
+    else:
+        assert tier == "Focus on building required skills first."
+    if gaps:
+        advice = result["recommendations"][0]
+        named = advice.removeprefix("Consider learning: ").split(", ")
+        assert len(named) == min(3, len(gaps)) and set(named) <= gaps
+
+def test_match_skills_rounds_half_up():
+    result = skills.match_skills({"student_skills": ["a"], "internship_skills": list("abcdefgh")})
+    assert result["match_score"] == 0.13
+
+def test_match_skills_empty_payload():
+    result = skills.match_skills({})
+    assert result["match_score"] == 0.0
+    assert result["matched_skills"] == [] and result["skill_gaps"] == []
+
+def test_out_of_vocabulary_skills_do_not_collide():
+    result = skills.match_skills({
+        "student_skills": ["Cobol", "python"],
+        "internship_skills": ["Python", "Haskell", "cobol", "Elixir"],
+    })
+    assert sorted(result["matched_skills"]) == ["cobol", "python"]
+    assert sorted(result["skill_gaps"]) == ["elixir", "haskell"]
+
+@pytest.mark.parametrize("seed", range(20))
+def test_score_skills_batch_matches_pairwise_scores(seed):
+    rng = random.Random(seed)
+    student = random_skills(rng, rng.randint(0, 8))
+    internships = [random_skills(rng, rng.randint(0, 8)) for _ in range(rng.randint(0, 10))]
+    scores = skills.score_skills_batch(student, internships)
+
+    assert scores.shape == (len(internships),)
+    for internship, score in zip(internships, scores):
+        assert score == pytest.approx(legacy_match(student, internship)[2])
+
+def test_score_skills_batch_ignores_duplicate_skills():
+    scores = skills.score_skills_batch(["Python", "python"], [["python", "PYTHON", "sql"]])
+    assert scores.tolist() == [0.5]
+
+def test_match_skills_batch_rounds_and_keeps_ids():
+    results = skills.match_skills_batch({
+        "student_skills": ["python"],
+        "internships": [{"id": "a", "skills": ["python", "sql", "go"]}, {"id": "b", "skills": []}],
+    })
+    assert results == [
+        {"internship_id": "a", "match_score": 0.33},
+        {"internship_id": "b", "match_score": 0.0},
+    ]
+
+@pytest.mark.parametrize("seed", range(50))
+def test_match_skills_batch_agrees_with_match_skills(seed):
+    rng = random.Random(seed)
+    student = random_skills(rng, rng.randint(0, 8))
+    internships = [random_skills(rng, rng.randint(0, 8)) for _ in range(20)]
+    results = skills.match_skills_batch({
+        "student_skills": student,
+        "internships": [{"id": i, "skills": s} for i, s in enumerate(internships)],
+    })
+    for result, internship in zip(results, internships):
+        single = skills.match_skills({"student_skills": student, "internship_skills": internship})
+        assert result["match_score"] == single["match_score"]
+
+def test_match_skills_batch_rounds_half_up():
+    results = skills.match_skills_batch({
+        "student_skills": ["a"],
+        "internships": [{"id": "x", "skills": list("abcdefgh")}],
+    })
+    assert results[0]["match_score"] == 0.13
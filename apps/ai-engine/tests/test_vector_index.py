@@ -0,0 +1,130 @@
+import threading
+import numpy as np
+import pytest
+import vector_index
+from vector_index import DenseIndex, Int8Index, IVFPQIndex, PQIndex
+
+DIM = 32
+SUBQUANTIZERS = 8
+
+@pytest.fixture(scope="module")
+def vectors():
+    return np.random.default_rng(0).standard_normal((3000, DIM)).astype(np.float32)
+
+@pytest.fixture(scope="module")
+def product_quantizer(vectors):
+    return vector_index.train_product_quantizer(vectors, SUBQUANTIZERS)
+
+@pytest.fixture(scope="module")
+def trained_ivfpq(vectors):
+    return vector_index.train_ivfpq(vectors, SUBQUANTIZERS)
+
+@pytest.fixture(params=["dense", "int8", "pq", "ivfpq"])
+def make_index(request, product_quantizer, trained_ivfpq):
+    def make(ids, rows):
+        if request.param == "dense":
+            return DenseIndex(ids, rows)
+        if request.param == "int8":
+            return Int8Index(ids, rows)
+        if request.param == "pq":
+            return PQIndex(product_quantizer, ids, vector_index.encode_vectors(product_quantizer, rows))
+        return IVFPQIndex(vector_index.faiss.clone_index(trained_ivfpq), ids, rows)
+    return make
+
+@pytest.mark.parametrize("k", [1, 5, 100, 1000, 1500])
+def test_top_k_matches_full_sort(k):
+    scores = np.random.default_rng(k).standard_normal(1000).astype(np.float32)
+    assert vector_index.top_k(scores, k).tolist() == np.argsort(-scores)[:k].tolist()
+
+def test_top_k_of_empty_scores():
+    assert vector_index.top_k(np.empty(0, dtype=np.float32), 5).tolist() == []
+
+def test_search_returns_each_stored_vector(make_index, vectors):
+    rows = vectors[:500]
+    index = make_index([f"id-{i}" for i in range(len(rows))], rows)
+    for i in range(0, len(rows), 50):
+        ids, scores = index.search(rows[i], 5)
+        assert f"id-{i}" in ids
+        assert len(ids) == len(scores) == 5
+        assert np.all(np.diff(scores) <= 1e-6)
+
+def test_search_on_empty_index(make_index):
+    ids, scores = make_index([], np.empty((0, DIM), dtype=np.float32)).search(np.ones(DIM, dtype=np.float32), 5)
+    assert ids == [] and len(scores) == 0
+
+def test_upsert_appends_and_overwrites(make_index, vectors):
+    index = make_index([f"id-{i}" for i in range(200)], vectors[:200])
+    index.upsert("new", vectors[1000])
+    index.upsert("id-7", vectors[1001])
+
+    assert len(index) == 201
+    assert "new" in index.search(vectors[1000], 5)[0]
+    assert "id-7" in index.search(vectors[1001], 5)[0]
+    # The overwritten vector no longer maps back to id-7
+    assert "id-7" not in index.search(vectors[7], 1)[0]
+
+def test_concurrent_upserts_keep_ids_aligned(make_index, vectors):
+    index = make_index([], np.empty((0, DIM), dtype=np.float32))
+    threads_n, per_thread = 4, 50
+
+    def upsert(t):
+        for i in range(per_thread):
+            row = t * per_thread + i
+            index.upsert(f"id-{row}", vectors[row])
+
+    threads = [threading.Thread(target=upsert, args=(t,)) for t in range(threads_n)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(index) == threads_n * per_thread
+    if hasattr(index, "snapshot"):
+        ids, matrix = index.snapshot()[:2]
+        assert len(ids) == len(matrix)
+    for row in range(0, threads_n * per_thread, 20):
+        assert f"id-{row}" in index.search(vectors[row], 5)[0]
+
+def test_ivfpq_search_batch_matches_single_searches(trained_ivfpq, vectors):
+    rows = vectors[:300]
+    index = IVFPQIndex(vector_index.faiss.clone_index(trained_ivfpq), [str(i) for i in range(len(rows))], rows)
+    batch = vector_index.search_batch(index, rows[:10], 5)
+    for query, (ids, scores) in zip(rows[:10], batch):
+        single_ids, single_scores = index.search(query, 5)
+        assert ids == single_ids
+        np.testing.assert_allclose(scores, single_scores, rtol=1e-5)
+
+def test_remove_drops_ids_from_search(make_index, vectors):
+    index = make_index([f"id-{i}" for i in range(200)], vectors[:200])
+    before = index.snapshot() if hasattr(index, "snapshot") else None
+    index.remove(["id-3", "id-150", "missing"])
+
+    assert len(index) == 198
+    assert index.id_set() == {f"id-{i}" for i in range(200)} - {"id-3", "id-150"}
+    assert "id-3" not in index.search(vectors[3], 5)[0]
+    assert "id-150" not in index.search(vectors[150], 5)[0]
+    assert "id-151" in index.search(vectors[151], 5)[0]
+    if before is not None:
+        # Snapshots taken before the removal stay aligned
+        assert len(before[0]) == len(before[1]) == 200
+
+def test_ivfpq_upserts_do_not_grow_the_index(trained_ivfpq, vectors):
+    index = IVFPQIndex(vector_index.faiss.clone_index(trained_ivfpq), ["a", "b"], vectors[:2])
+    for i in range(50):
+        index.upsert("a", vectors[i + 10])
+    assert index.cpu_index.ntotal == 2
+    assert index.search(vectors[59], 1)[0] == ["a"]
+
+def test_ivfpq_rebuilds_stale_clone(trained_ivfpq, vectors, monkeypatch):
+    # Stand in for a GPU clone, which keeps removed rows until rebuilt
+    monkeypatch.setattr(IVFPQIndex, "clone", lambda self: vector_index.faiss.clone_index(self.cpu_index))
+    monkeypatch.setattr(IVFPQIndex, "MAX_STALE", 10)
+    index = IVFPQIndex(vector_index.faiss.clone_index(trained_ivfpq), [f"id-{i}" for i in range(100)], vectors[:100])
+    index.index = index.clone()
+
+    index.remove([f"id-{i}" for i in range(5)])
+    assert index.stale == 5 and index.index.ntotal == 100
+    assert "id-0" not in index.search(vectors[0], 5)[0]
+
+    index.remove([f"id-{i}" for i in range(5, 20)])
+    assert index.stale == 0 and index.index.ntotal == 80
@@ -0,0 +1,37 @@
+"""
+Train an empty IVF-PQ index offline on the internship embeddings.
+
+Usage: python train_ivfpq.py [index_path]
+
+The index path defaults to IVFPQ_INDEX_PATH. Only the coarse centroids
+and PQ codebook are written; the AI engine adds the published
+internships at startup and moves the index to the GPU when one is
+available.
+"""
+import json
+import sys
+import faiss
+import numpy as np
+import psycopg2
+from main import DATABASE_URL, IVFPQ_INDEX_PATH, libpq_dsn
+from vector_index import train_ivfpq
+
+def main(index_path: str):
+    with psycopg2.connect(libpq_dsn(DATABASE_URL)) as conn, conn.cursor() as cur:
+        cur.execute("SELECT embedding::text FROM internships WHERE embedding IS NOT NULL")
+        rows = cur.fetchall()
+
+    vectors = np.array([json.loads(embedding) for embedding, in rows], dtype=np.float32)
+    nlist = max(1, int(4 * np.sqrt(len(vectors))))
+    if len(vectors) < 39 * nlist:
+        sys.exit(f"Need at least {39 * nlist} embedded internships to train, found {len(vectors)}")
+
+    index = train_ivfpq(vectors)
+    faiss.write_index(index, index_path)
+    print(f"Trained {index.nlist} inverted lists on {len(vectors)} internships, index at {index_path}")
+
+if __name__ == "__main__":
+    path = sys.argv[1] if len(sys.argv) > 1 else IVFPQ_INDEX_PATH
+    if not path or not DATABASE_URL:
+        sys.exit("Set DATABASE_URL and pass an index path or set IVFPQ_INDEX_PATH")
+    main(path)
@@ -0,0 +1,40 @@
+"""
+Train the internship PQ codebook offline and write PQ codes back to the
+internships table.
+
+Usage: python train_pq.py [codebook_path]
+
+The codebook path defaults to PQ_CODEBOOK_PATH; point the AI engine at
+the same file so recommendations use the codes.
+"""
+import json
+import sys
+import faiss
+import numpy as np
+import psycopg2
+from main import DATABASE_URL, PQ_CODEBOOK_PATH, libpq_dsn
+from vector_index import PQ_BITS, encode_vectors, train_product_quantizer
+
+def main(codebook_path: str):
+    with psycopg2.connect(libpq_dsn(DATABASE_URL)) as conn, conn.cursor() as cur:
+        cur.execute("SELECT id, embedding::text FROM internships WHERE embedding IS NOT NULL")
+        rows = cur.fetchall()
+        if len(rows) < 2 ** PQ_BITS:
+            sys.exit(f"Need at least {2 ** PQ_BITS} embedded internships to train, found {len(rows)}")
+
+        vectors = np.array([json.loads(embedding) for _, embedding in rows], dtype=np.float32)
+        pq = train_product_quantizer(vectors)
+        codes = encode_vectors(pq, vectors)
+        cur.executemany(
+            "UPDATE internships SET embedding_pq = %s WHERE id = %s",
+            [(code.tobytes(), internship_id) for (internship_id, _), code in zip(rows, codes)]
+        )
+
+    faiss.write_ProductQuantizer(pq, codebook_path)
+    print(f"Encoded {len(rows)} internships into {pq.M}-byte codes, codebook at {codebook_path}")
+
+if __name__ == "__main__":
+    path = sys.argv[1] if len(sys.argv) > 1 else PQ_CODEBOOK_PATH
+    if not path or not DATABASE_URL:
+        sys.exit("Set DATABASE_URL and pass a codebook path or set PQ_CODEBOOK_PATH")
+    main(path)
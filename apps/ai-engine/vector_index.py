@@ -0,0 +1,401 @@
+"""
+In-memory internship vector indexes used by recommendations.
+"""
+from typing import List, Optional, Tuple
+import threading
+import faiss
+import numba
+import numpy as np
+
+PQ_SUBQUANTIZERS = 96
+PQ_BITS = 8
+
+def train_product_quantizer(
+    vectors: np.ndarray, subquantizers: int = PQ_SUBQUANTIZERS, bits: int = PQ_BITS
+) -> faiss.ProductQuantizer:
+    """
+    Train a PQ codebook offline on the internship corpus.
+    Needs at least 2**bits training vectors.
+    """
+    vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+    pq = faiss.ProductQuantizer(vectors.shape[1], subquantizers, bits)
+    pq.train(vectors)
+    return pq
+
+def encode_vectors(pq: faiss.ProductQuantizer, vectors: np.ndarray) -> np.ndarray:
+    return pq.compute_codes(np.ascontiguousarray(vectors, dtype=np.float32))
+
+def top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    """
+    Indices of the k highest scores, best first. argpartition selects
+    them in O(N) without negating a copy of scores, so only the k
+    winners are sorted.
+    """
+    n = len(scores)
+    k = min(k, n)
+    top = np.argpartition(scores, n - k)[n - k:] if k < n else np.arange(n)
+    return top[np.argsort(-scores[top])]
+
+def remaining_rows(rows: dict, ids: List[str], removed) -> Optional[List[int]]:
+    # Rows left after dropping removed ids, or None when none are indexed
+    dropped = {rows[internship_id] for internship_id in removed if internship_id in rows}
+    if not dropped:
+        return None
+    return [row for row in range(len(ids)) if row not in dropped]
+
+class PQIndex:
+    """
+    Product-quantized internship embeddings. Each internship is stored as
+    M uint8 codes and scored against a query through an asymmetric
+    distance table of M x 2**bits inner products.
+    """
+
+    def __init__(self, pq: faiss.ProductQuantizer, ids: List[str], codes: np.ndarray):
+        if pq.nbits != 8:
+            raise ValueError("PQIndex expects 8-bit codes")
+        self.pq = pq
+        self.ids = list(ids)
+        self.rows = {internship_id: i for i, internship_id in enumerate(self.ids)}
+        self.codes = np.asarray(codes, dtype=np.uint8).reshape(len(self.ids), pq.M)
+        self.lock = threading.Lock()
+        self.centroids = faiss.vector_to_array(pq.centroids).reshape(pq.M, pq.ksub, pq.dsub)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def upsert(self, internship_id: str, vector: np.ndarray):
+        code = encode_vectors(self.pq, np.asarray(vector, dtype=np.float32).reshape(1, -1))
+        with self.lock:
+            row = self.rows.get(internship_id)
+            if row is None:
+                self.rows[internship_id] = len(self.ids)
+                self.ids.append(internship_id)
+                self.codes = np.vstack([self.codes, code])
+            else:
+                self.codes[row] = code[0]
+
+    def remove(self, internship_ids):
+        with self.lock:
+            keep = remaining_rows(self.rows, self.ids, internship_ids)
+            if keep is None:
+                return
+            self.ids = [self.ids[row] for row in keep]
+            self.rows = {internship_id: i for i, internship_id in enumerate(self.ids)}
+            self.codes = self.codes[keep]
+
+    def id_set(self) -> set:
+        with self.lock:
+            return set(self.rows)
+
+    def snapshot(self) -> Tuple[List[str], np.ndarray]:
+        # Appends grow ids in step with codes under the lock and removals
+        # swap in new objects, so every row of this codes array maps to the
+        # same position in ids
+        with self.lock:
+            return self.ids, self.codes
+
+    def search(self, query: np.ndarray, k: int) -> Tuple[List[str], np.ndarray]:
+        """
+        Top-k internships by approximate inner product with the query.
+        """
+        ids, codes = self.snapshot()
+        if not len(codes):
+            return [], np.empty(0, dtype=np.float32)
+        query = np.asarray(query, dtype=np.float32).reshape(self.pq.M, self.pq.dsub)
+        table = np.einsum("mkd,md->mk", self.centroids, query)
+        scores = table[np.arange(self.pq.M), codes].sum(1)
+
+        top = top_k(scores, k)
+        return [ids[i] for i in top], scores[top]
+
+@numba.njit(parallel=True, fastmath=True, cache=True)
+def dot_scores(query: np.ndarray, matrix: np.ndarray) -> np.ndarray:
+    n, d = matrix.shape
+    scores = np.empty(n, dtype=np.float32)
+    for i in numba.prange(n):
+        s = np.float32(0.0)
+        for j in range(d):
+            s += query[j] * matrix[i, j]
+        scores[i] = s
+    return scores
+
+def normalize_rows(vectors: np.ndarray) -> np.ndarray:
+    vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors / np.maximum(norms, np.float32(1e-12))
+
+class DenseIndex:
+    """
+    Exact cosine search over full FP32 embeddings for catalogs small
+    enough to scan. Rows are normalized once when added, so a query is
+    a single parallel dot-product pass plus a partial top-k.
+    """
+
+    def __init__(self, ids: List[str], vectors: np.ndarray):
+        self.ids = list(ids)
+        self.rows = {internship_id: i for i, internship_id in enumerate(self.ids)}
+        self.vectors = normalize_rows(vectors)
+        self.lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def upsert(self, internship_id: str, vector: np.ndarray):
+        vector = normalize_rows(np.asarray(vector, dtype=np.float32).reshape(1, -1))
+        with self.lock:
+            row = self.rows.get(internship_id)
+            if row is None:
+                self.rows[internship_id] = len(self.ids)
+                self.ids.append(internship_id)
+                self.vectors = np.vstack([self.vectors, vector])
+            else:
+                self.vectors[row] = vector[0]
+
+    def remove(self, internship_ids):
+        with self.lock:
+            keep = remaining_rows(self.rows, self.ids, internship_ids)
+            if keep is None:
+                return
+            self.ids = [self.ids[row] for row in keep]
+            self.rows = {internship_id: i for i, internship_id in enumerate(self.ids)}
+            self.vectors = self.vectors[keep]
+
+    def id_set(self) -> set:
+        with self.lock:
+            return set(self.rows)
+
+    def snapshot(self) -> Tuple[List[str], np.ndarray]:
+        with self.lock:
+            return self.ids, self.vectors
+
+    def search(self, query: np.ndarray, k: int) -> Tuple[List[str], np.ndarray]:
+        """
+        Top-k internships by exact cosine similarity with the query.
+        """
+        ids, vectors = self.snapshot()
+        if not len(vectors):
+            return [], np.empty(0, dtype=np.float32)
+        query = normalize_rows(np.asarray(query, dtype=np.float32).reshape(1, -1))[0]
+        scores = dot_scores(query, vectors)
+
+        top = top_k(scores, k)
+        return [ids[i] for i in top], scores[top]
+
+def quantize_int8(vectors: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Symmetric per-vector int8 quantization of row-normalized vectors:
+    x ~= codes * scale with scale = max(|x|) / 127.
+    """
+    vectors = normalize_rows(vectors)
+    scales = np.maximum(np.abs(vectors).max(axis=1) / 127, np.float32(1e-12)).astype(np.float32)
+    codes = np.round(vectors / scales[:, None]).astype(np.int8)
+    return codes, scales
+
+@numba.njit(parallel=True, cache=True)
+def int8_dot_scores(
+    query_codes: np.ndarray, query_scale: float, codes: np.ndarray, scales: np.ndarray
+) -> np.ndarray:
+    # int8 x int8 products accumulated in int32 so LLVM can emit packed
+    # multiply-add (VNNI where the host supports it)
+    n, d = codes.shape
+    scores = np.empty(n, dtype=np.float32)
+    for i in numba.prange(n):
+        acc = np.int32(0)
+        for j in range(d):
+            acc += np.int32(query_codes[j]) * np.int32(codes[i, j])
+        scores[i] = acc * scales[i] * query_scale
+    return scores
+
+class Int8Index:
+    """
+    Exact-scan index over int8-quantized embeddings: a quarter of the
+    bytes per candidate of DenseIndex, with integer dot products.
+    """
+
+    def __init__(self, ids: List[str], vectors: np.ndarray):
+        self.ids = list(ids)
+        self.rows = {internship_id: i for i, internship_id in enumerate(self.ids)}
+        self.codes, self.scales = quantize_int8(vectors)
+        self.lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def upsert(self, internship_id: str, vector: np.ndarray):
+        code, scale = quantize_int8(np.asarray(vector, dtype=np.float32).reshape(1, -1))
+        with self.lock:
+            row = self.rows.get(internship_id)
+            if row is None:
+                self.rows[internship_id] = len(self.ids)
+                self.ids.append(internship_id)
+                self.codes = np.vstack([self.codes, code])
+                self.scales = np.concatenate([self.scales, scale])
+            else:
+                self.codes[row] = code[0]
+                self.scales[row] = scale[0]
+
+    def remove(self, internship_ids):
+        with self.lock:
+            keep = remaining_rows(self.rows, self.ids, internship_ids)
+            if keep is None:
+                return
+            self.ids = [self.ids[row] for row in keep]
+            self.rows = {internship_id: i for i, internship_id in enumerate(self.ids)}
+            self.codes = self.codes[keep]
+            self.scales = self.scales[keep]
+
+    def id_set(self) -> set:
+        with self.lock:
+            return set(self.rows)
+
+    def snapshot(self) -> Tuple[List[str], np.ndarray, np.ndarray]:
+        with self.lock:
+            return self.ids, self.codes, self.scales
+
+    def search(self, query: np.ndarray, k: int) -> Tuple[List[str], np.ndarray]:
+        """
+        Top-k internships by approximate cosine similarity with the query.
+        """
+        ids, codes, scales = self.snapshot()
+        if not len(codes):
+            return [], np.empty(0, dtype=np.float32)
+        query_codes, query_scale = quantize_int8(np.asarray(query, dtype=np.float32).reshape(1, -1))
+        scores = int8_dot_scores(query_codes[0], query_scale[0], codes, scales)
+
+        top = top_k(scores, k)
+        return [ids[i] for i in top], scores[top]
+
+IVF_NPROBE = 16
+
+def gpu_count() -> int:
+    # faiss-cpu builds may not expose the GPU helpers at all
+    return getattr(faiss, "get_num_gpus", lambda: 0)()
+
+def train_ivfpq(
+    vectors: np.ndarray, subquantizers: int = PQ_SUBQUANTIZERS, bits: int = PQ_BITS
+) -> faiss.Index:
+    """
+    Train an empty inner-product IVF-PQ index offline on the corpus,
+    with about 4 * sqrt(N) inverted lists.
+    """
+    vectors = normalize_rows(vectors)
+    d = vectors.shape[1]
+    nlist = max(1, int(4 * np.sqrt(len(vectors))))
+    quantizer = faiss.IndexFlatIP(d)
+    index = faiss.IndexIVFPQ(quantizer, d, nlist, subquantizers, bits, faiss.METRIC_INNER_PRODUCT)
+    index.train(vectors)
+    return index
+
+class IVFPQIndex:
+    """
+    IVF-PQ index for catalogs beyond what a scan can serve, cloned to
+    the GPU when one is available and kept on the CPU otherwise.
+    The CPU index is the master copy and drops replaced or removed rows
+    right away. GPU IVF indexes cannot remove vectors, so the clone keeps
+    them as stale ids that searches skip until MAX_STALE pile up and the
+    clone is rebuilt from the master.
+    """
+
+    MAX_GPU_K = 2048
+    MAX_STALE = MAX_GPU_K // 2
+
+    def __init__(self, index: faiss.Index, ids: List[str], vectors: np.ndarray, nprobe: int = IVF_NPROBE):
+        faiss.extract_index_ivf(index).nprobe = nprobe
+        self.cpu_index = self.index = index
+        self.lock = threading.Lock()
+        self.next_id = 0
+        self.internship_ids = {}
+        self.current = {}
+        self.stale = 0
+        self.add(ids, vectors)
+        self.gpu = gpu_count() > 0
+        if self.gpu:
+            self.resources = faiss.StandardGpuResources()
+            self.index = self.clone()
+
+    def __len__(self) -> int:
+        return len(self.current)
+
+    def clone(self) -> faiss.Index:
+        options = faiss.GpuClonerOptions()
+        # 96 sub-quantizers need half-precision lookup tables to fit shared memory
+        options.useFloat16 = True
+        return faiss.index_cpu_to_gpu(self.resources, 0, self.cpu_index, options)
+
+    def drop(self, faiss_ids: List[int]):
+        # Called with the lock held
+        if not faiss_ids:
+            return
+        self.cpu_index.remove_ids(np.asarray(faiss_ids, dtype=np.int64))
+        for faiss_id in faiss_ids:
+            del self.internship_ids[faiss_id]
+        if self.index is not self.cpu_index:
+            self.stale += len(faiss_ids)
+            if self.stale > self.MAX_STALE:
+                self.index = self.clone()
+                self.stale = 0
+
+    def add(self, ids: List[str], vectors: np.ndarray):
+        if not ids:
+            return
+        vectors = normalize_rows(vectors)
+        with self.lock:
+            self.drop([self.current[internship_id] for internship_id in ids if internship_id in self.current])
+            faiss_ids = np.arange(self.next_id, self.next_id + len(ids), dtype=np.int64)
+            self.next_id += len(ids)
+            self.cpu_index.add_with_ids(vectors, faiss_ids)
+            if self.index is not self.cpu_index:
+                self.index.add_with_ids(vectors, faiss_ids)
+            for faiss_id, internship_id in zip(faiss_ids.tolist(), ids):
+                self.internship_ids[faiss_id] = internship_id
+                self.current[internship_id] = faiss_id
+
+    def upsert(self, internship_id: str, vector: np.ndarray):
+        self.add([internship_id], np.asarray(vector, dtype=np.float32).reshape(1, -1))
+
+    def remove(self, internship_ids):
+        with self.lock:
+            self.drop([self.current.pop(i) for i in internship_ids if i in self.current])
+
+    def id_set(self) -> set:
+        with self.lock:
+            return set(self.current)
+
+    def search(self, query: np.ndarray, k: int) -> Tuple[List[str], np.ndarray]:
+        return self.search_batch(np.asarray(query, dtype=np.float32).reshape(1, -1), k)[0]
+
+    def search_batch(self, queries: np.ndarray, k: int) -> List[Tuple[List[str], np.ndarray]]:
+        """
+        Top-k internships for each row of a (B, d) query matrix in one
+        index call.
+        """
+        with self.lock:
+            if not self.current:
+                return [([], np.empty(0, dtype=np.float32)) for _ in range(len(queries))]
+            # Over-fetch by the stale rows still in a GPU clone so k live ones remain
+            fetch = min(k + self.stale, self.index.ntotal)
+            if self.index is not self.cpu_index:
+                fetch = min(fetch, self.MAX_GPU_K)
+            scores, faiss_ids = self.index.search(normalize_rows(queries), fetch)
+
+        # Rows removed since the search miss here and are skipped like stale ones
+        internship_ids = self.internship_ids
+
+        results = []
+        for row_scores, row_ids in zip(scores, faiss_ids):
+            ids, kept = [], []
+            for score, faiss_id in zip(row_scores.tolist(), row_ids.tolist()):
+                internship_id = internship_ids.get(faiss_id)
+                if internship_id is None:
+                    continue
+                ids.append(internship_id)
+                kept.append(score)
+                if len(ids) == k:
+                    break
+            results.append((ids, np.asarray(kept, dtype=np.float32)))
+        return results
+
+def search_batch(index, queries: np.ndarray, k: int) -> List[Tuple[List[str], np.ndarray]]:
+    if isinstance(index, IVFPQIndex):
+        return index.search_batch(queries, k)
+    return [index.search(query, k) for query in queries]
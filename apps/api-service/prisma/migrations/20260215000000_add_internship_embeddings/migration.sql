@@ -0,0 +1,8 @@
+-- CreateExtension
+CREATE EXTENSION IF NOT EXISTS "vector";
+
+-- AlterTable
+ALTER TABLE "internships" ADD COLUMN     "embedding" vector(1536);
+
+-- CreateIndex
+CREATE INDEX "internships_embedding_idx" ON "internships" USING hnsw ("embedding" vector_cosine_ops) WITH (m = 16, ef_construction = 64);
@@ -0,0 +1,2 @@
+-- AlterTable
+ALTER TABLE "internships" ADD COLUMN     "embedding_pq" BYTEA;
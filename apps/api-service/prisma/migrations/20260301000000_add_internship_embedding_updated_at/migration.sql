@@ -0,0 +1,8 @@
+-- AlterTable
+ALTER TABLE "internships" ADD COLUMN     "embedding_updated_at" TIMESTAMP(3);
+
+-- Backfill existing embeddings
+UPDATE "internships" SET "embedding_updated_at" = "updated_at" WHERE "embedding" IS NOT NULL;
+
+-- CreateIndex
+CREATE INDEX "internships_embedding_updated_at_idx" ON "internships"("embedding_updated_at");
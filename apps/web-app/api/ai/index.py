@@ -1,48 +1,205 @@
+from array import array
 from http.server import BaseHTTPRequestHandler
-import json
+import functools
+import hashlib
+import os
+import pickle
+import re
+import sys
+import traceback
+import urllib.error
+import urllib.request
+import orjson
+
+# Vercel loads handlers by file path from the project root, so the
+# handler directory is not on sys.path for sibling imports
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from _skills import match_skills, match_skills_batch
+
+EMBEDDING_MODEL = os.environ.get('EMBEDDING_MODEL', 'text-embedding-3-small')
+# Matches the vector(1536) column; text-embedding-3 models are asked for this size
+EMBEDDING_DIM = 1536
+# /tmp is the only writable path in the serverless runtime
+EMBEDDING_CACHE_DIR = os.environ.get('EMBEDDING_CACHE_DIR', '/tmp/sip-embeddings')
+# OpenAI rejects embedding requests with more inputs than this
+EMBEDDING_BATCH_LIMIT = 2048
+
+# Service info never changes between deploys, so it is serialized once
+# and left to the edge cache
+SERVICE_INFO = orjson.dumps({
+    "service": "SIP AI Engine",
+    "status": "running",
+    "version": "1.0.0"
+})
+
+def local_embedding(text):
+    # Deterministic unit vector seeded from the text hash, used without an OpenAI key;
+    # it carries no meaning, so it is never cached to disk
+    import numpy as np
+    seed = int.from_bytes(hashlib.sha256(text.encode()).digest()[:8], 'little')
+    vector = np.random.default_rng(seed).standard_normal(EMBEDDING_DIM)
+    return array('f', (vector / np.linalg.norm(vector)).tolist())
+
+def provider_embeddings(texts):
+    # As few provider calls as the input limit allows; results come back aligned with texts
+    api_key = os.environ.get('OPENAI_API_KEY')
+    if not api_key:
+        return [local_embedding(text) for text in texts]
+    vectors = []
+    for start in range(0, len(texts), EMBEDDING_BATCH_LIMIT):
+        vectors.extend(request_embeddings(texts[start:start + EMBEDDING_BATCH_LIMIT], api_key))
+    return vectors
+
+def request_embeddings(texts, api_key):
+    payload = {'input': texts, 'model': EMBEDDING_MODEL}
+    if EMBEDDING_MODEL.startswith('text-embedding-3'):
+        payload['dimensions'] = EMBEDDING_DIM
+    request = urllib.request.Request(
+        'https://api.openai.com/v1/embeddings',
+        data=orjson.dumps(payload),
+        headers={'Authorization': f'Bearer {api_key}', 'Content-Type': 'application/json'}
+    )
+    with urllib.request.urlopen(request, timeout=30) as response:
+        data = orjson.loads(response.read())['data']
+    # float32 arrays take 6KB per vector against ~49KB as a tuple of floats
+    return [array('f', item['embedding']) for item in sorted(data, key=lambda item: item['index'])]
+
+def embedding_cache_path(text):
+    # Only provider vectors are cached, keyed on the provider and model
+    key = hashlib.sha256(f'openai:{EMBEDDING_MODEL}:{text}'.encode()).hexdigest()[:16]
+    return os.path.join(EMBEDDING_CACHE_DIR, f'{key}.pkl')
+
+def load_cached_embedding(text):
+    try:
+        with open(embedding_cache_path(text), 'rb') as f:
+            cached_text, vector = pickle.load(f)
+    except (OSError, EOFError, pickle.UnpicklingError, ValueError):
+        return None
+    # Entries written before the switch to arrays hold tuples
+    return array('f', vector) if cached_text == text else None
+
+def store_cached_embedding(text, vector):
+    path = embedding_cache_path(text)
+    os.makedirs(EMBEDDING_CACHE_DIR, exist_ok=True)
+    tmp_path = f'{path}.{os.getpid()}.tmp'
+    with open(tmp_path, 'wb') as f:
+        pickle.dump((text, vector), f)
+    os.replace(tmp_path, path)
+
+@functools.lru_cache(maxsize=4096)
+def provider_embedding(text):
+    # Memoized per warm instance and persisted to disk across invocations
+    vector = load_cached_embedding(text)
+    if vector is None:
+        vector = provider_embeddings([text])[0]
+        store_cached_embedding(text, vector)
+    return vector
+
+def embed_text(text):
+    # Checked before the memoized call so fallback vectors never fill it
+    if not os.environ.get('OPENAI_API_KEY'):
+        return local_embedding(text)
+    return provider_embedding(text)
+
+def embed_texts(texts):
+    # Every disk-cache miss goes out in a single provider call
+    if not os.environ.get('OPENAI_API_KEY'):
+        return [local_embedding(text) for text in texts]
+    missing = [text for text in dict.fromkeys(texts) if load_cached_embedding(text) is None]
+    if missing:
+        for text, vector in zip(missing, provider_embeddings(missing)):
+            store_cached_embedding(text, vector)
+    return [embed_text(text) for text in texts]
+
+def get_recommendations(data):
+    return [
+        {
+            "internship_id": "mock-id-1",
+            "match_score": 0.85,
+            "reasoning": "Strong match based on React and TypeScript skills"
+        },
+        {
+            "internship_id": "mock-id-2",
+            "match_score": 0.72,
+            "reasoning": "Good fit for Python and ML background"
+        }
+    ]
+
+def generate_embeddings(data):
+    text = data.get('text', '')
+    embedding = embed_text(text)
+    return {
+        "text": text,
+        "embedding_length": len(embedding),
+        "status": "generated"
+    }
+
+def generate_embeddings_batch(data):
+    embeddings = embed_texts(data.get('texts', []))
+    return {
+        "embeddings": [embedding.tolist() for embedding in embeddings],
+        "embedding_length": EMBEDDING_DIM,
+        "status": "generated"
+    }
+
+def analyze_resume(data):
+    return {
+        "extracted_skills": ["Python", "JavaScript", "React", "SQL"],
+        "experience_level": "Intermediate",
+        "suggested_roles": ["Full Stack Developer", "Backend Developer"],
+        "confidence": 0.82
+    }
+
+ROUTES = {
+    'match/skills': match_skills,
+    'match/skills/batch': match_skills_batch,
+    'recommendations': get_recommendations,
+    'embeddings/generate': generate_embeddings,
+    'embeddings/generate_batch': generate_embeddings_batch,
+    'analyze/resume': analyze_resume,
+}
+# One compiled alternation instead of a substring scan per route; longer
+# routes come first so /match/skills/batch never matches as /match/skills
+ROUTE_PATTERN = re.compile('/(' + '|'.join(map(re.escape, sorted(ROUTES, key=len, reverse=True))) + ')')
 
 class handler(BaseHTTPRequestHandler):
     def do_GET(self):
         self.send_response(200)
         self.send_header('Content-type', 'application/json')
+        self.send_header('Content-Length', str(len(SERVICE_INFO)))
+        self.send_header('Cache-Control', 'public, max-age=3600, s-maxage=86400')
         self.send_header('Access-Control-Allow-Origin', '*')
         self.end_headers()
         
-        response = {
-            "service": "SIP AI Engine",
-            "status": "running",
-            "version": "1.0.0"
-        }
-        self.wfile.write(json.dumps(response).encode())
+        self.wfile.write(SERVICE_INFO)
 
     def do_POST(self):
         content_length = int(self.headers.get('Content-Length', 0))
         body = self.rfile.read(content_length)
         
         try:
-            data = json.loads(body) if body else {}
+            data = orjson.loads(body) if body else {}
         except:
             data = {}
         
-        self.send_response(200)
+        # Run the route before the status line goes out so failures map to 5xx
+        status = 200
+        route = ROUTE_PATTERN.search(self.path)
+        try:
+            response = ROUTES[route.group(1)](data) if route else {"error": "Not found"}
+        except urllib.error.URLError:
+            traceback.print_exc()
+            status, response = 502, {"error": "Embedding provider unavailable"}
+        except Exception:
+            traceback.print_exc()
+            status, response = 500, {"error": "Internal server error"}
+        
+        self.send_response(status)
         self.send_header('Content-type', 'application/json')
         self.send_header('Access-Control-Allow-Origin', '*')
         self.end_headers()
         
-        path = self.path
-        
-        if '/match/skills' in path:
-            response = self.match_skills(data)
-        elif '/recommendations' in path:
-            response = self.get_recommendations(data)
-        elif '/embeddings/generate' in path:
-            response = self.generate_embeddings(data)
-        elif '/analyze/resume' in path:
-            response = self.analyze_resume(data)
-        else:
-            response = {"error": "Not found"}
-        
-        self.wfile.write(json.dumps(response).encode())
+        self.wfile.write(orjson.dumps(response))
 
     def do_OPTIONS(self):
         self.send_response(200)
@@ -51,61 +208,6 @@ class handler(BaseHTTPRequestHandler):
         self.send_header('Access-Control-Allow-Headers', 'Content-Type, Authorization')
         self.end_headers()
 
-    def match_skills(self, data):
-        student_skills = set(s.lower() for s in data.get('student_skills', []))
-        internship_skills = set(s.lower() for s in data.get('internship_skills', []))
-        
-        matched = student_skills & internship_skills
-        skill_gaps = internship_skills - student_skills
-        
-        if len(internship_skills) == 0:
-            match_score = 0.0
-        else:
-            match_score = len(matched) / len(internship_skills)
-        
-        recommendations = []
-        if len(skill_gaps) > 0:
-            recommendations.append(f"Consider learning: {', '.join(list(skill_gaps)[:3])}")
-        if match_score > 0.7:
-            recommendations.append("Strong match! Apply with confidence.")
-        elif match_score > 0.5:
-            recommendations.append("Good match. Highlight your transferable skills.")
-        else:
-            recommendations.append("Focus on building required skills first.")
-        
-        return {
-            "match_score": round(match_score, 2),
-            "matched_skills": list(matched),
-            "skill_gaps": list(skill_gaps),
-            "recommendations": recommendations
-        }
-
-    def get_recommendations(self, data):
-        return [
-            {
-                "internship_id": "mock-id-1",
-                "match_score": 0.85,
-                "reasoning": "Strong match based on React and TypeScript skills"
-            },
-            {
-                "internship_id": "mock-id-2",
-                "match_score": 0.72,
-                "reasoning": "Good fit for Python and ML background"
-            }
-        ]
-
-    def generate_embeddings(self, data):
-        text = data.get('text', '')
-        return {
-            "text": text,
-            "embedding_length": 1536,
-            "status": "generated"
-        }
-
-    def analyze_resume(self, data):
-        return {
-            "extracted_skills": ["Python", "JavaScript", "React", "SQL"],
-            "experience_level": "Intermediate",
-            "suggested_roles": ["Full Stack Developer", "Backend Developer"],
-            "confidence": 0.82
-        }
+if __name__ == '__main__':
+    from _serve import serve
+    serve(handler)
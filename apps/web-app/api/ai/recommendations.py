@@ -1,5 +1,5 @@
 from http.server import BaseHTTPRequestHandler
-import json
+import orjson
 
 class handler(BaseHTTPRequestHandler):
     def do_POST(self):
@@ -7,7 +7,7 @@ class handler(BaseHTTPRequestHandler):
         body = self.rfile.read(content_length)
         
         try:
-            data = json.loads(body) if body else {}
+            data = orjson.loads(body) if body else {}
         except:
             data = {}
         
@@ -30,7 +30,7 @@ class handler(BaseHTTPRequestHandler):
             }
         ]
         
-        self.wfile.write(json.dumps(response).encode())
+        self.wfile.write(orjson.dumps(response))
 
     def do_OPTIONS(self):
         self.send_response(200)
@@ -38,3 +38,7 @@ class handler(BaseHTTPRequestHandler):
         self.send_header('Access-Control-Allow-Methods', 'POST, OPTIONS')
         self.send_header('Access-Control-Allow-Headers', 'Content-Type, Authorization')
         self.end_headers()
+
+if __name__ == '__main__':
+    from _serve import serve
+    serve(handler)
@@ -0,0 +1,120 @@
+# Skill matching shared by the AI handlers and the AI engine.
+# Source of truth: libs/skill-matching/skills.py. Every deployable gets a
+# byte-identical copy (api/ai/_skills.py, apps/web-app/api/ai/_skills.py,
+# apps/ai-engine/skills.py) written by libs/skill-matching/sync.py, since
+# each one is bundled on its own; edit the source and re-run the sync.
+# The handler copies keep a leading underscore so Vercel does not deploy
+# them as functions of their own.
+
+# Canonical lowercase skill vocabulary; each skill owns one bit in a skill mask
+SKILL_NAMES = (
+    "javascript", "typescript", "python", "java", "c", "c++", "c#", "go",
+    "rust", "ruby", "php", "kotlin", "swift", "sql", "html", "css",
+    "react", "next.js", "vue", "angular", "node.js", "express", "nestjs",
+    "django", "flask", "fastapi", "spring", "graphql", "rest",
+    "postgresql", "mysql", "mongodb", "redis", "prisma",
+    "docker", "kubernetes", "aws", "gcp", "azure", "git", "linux",
+    "machine learning", "deep learning", "data analysis", "pandas",
+    "numpy", "tensorflow", "pytorch", "nlp", "figma", "ui/ux",
+    "communication", "teamwork", "problem solving",
+)
+SKILL_ID = {name: i for i, name in enumerate(SKILL_NAMES)}
+SKILL_BIT = {name: 1 << i for name, i in SKILL_ID.items()}
+
+# Recommendation per match tier, indexed by (score > 0.7) + (score > 0.5)
+TIER_MESSAGES = (
+    "Focus on building required skills first.",
+    "Good match. Highlight your transferable skills.",
+    "Strong match! Apply with confidence.",
+)
+
+def skill_mask(skills, extra_ids):
+    # Skills outside the vocabulary get request-local bits after it
+    mask = 0
+    for skill in map(str.lower, skills):
+        bit = SKILL_BIT.get(skill)
+        if bit is None:
+            bit = 1 << extra_ids.setdefault(skill, len(SKILL_ID) + len(extra_ids))
+        mask |= bit
+    return mask
+
+def skill_names(mask, extra_ids):
+    # Bit ids index straight into the vocabulary; the request-local names
+    # are only appended when the mask actually has bits past it
+    names = SKILL_NAMES
+    if mask >> len(SKILL_NAMES):
+        names += tuple(extra_ids)
+    result = []
+    while mask:
+        low = mask & -mask
+        result.append(names[low.bit_length() - 1])
+        mask ^= low
+    return result
+
+def count_skills_batch(student_skills, internship_skills):
+    # Intern skills into a shared vocabulary and score all internships at once.
+    # NumPy is imported here so single-pair matching never pays its import
+    import numpy as np
+
+    vocab = {}
+    rows, cols = [], []
+    for i, skills in enumerate(internship_skills):
+        for skill in map(str.lower, skills):
+            rows.append(i)
+            cols.append(vocab.setdefault(skill, len(vocab)))
+    
+    internship_mat = np.zeros((len(internship_skills), len(vocab)), dtype=np.uint8)
+    internship_mat[rows, cols] = 1
+    
+    student_row = np.zeros(len(vocab), dtype=np.uint8)
+    student_row[[vocab[s] for s in map(str.lower, student_skills) if s in vocab]] = 1
+    
+    matched = (student_row[None, :] & internship_mat).sum(1, dtype=np.int64)
+    required = np.maximum(internship_mat.sum(1, dtype=np.int64), 1)
+    return matched, required
+
+def score_skills_batch(student_skills, internship_skills):
+    matched, required = count_skills_batch(student_skills, internship_skills)
+    return matched / required
+
+def match_skills(data):
+    student_skills = data.get('student_skills', ())
+    internship_skills = data.get('internship_skills', ())
+    extra_ids = {}
+    student_mask = skill_mask(student_skills, extra_ids)
+    internship_mask = skill_mask(internship_skills, extra_ids)
+    
+    matched_mask = student_mask & internship_mask
+    gaps_mask = internship_mask & ~student_mask
+    matched = skill_names(matched_mask, extra_ids)
+    skill_gaps = skill_names(gaps_mask, extra_ids)
+    
+    matched_count = matched_mask.bit_count()
+    required_count = max(internship_mask.bit_count(), 1)
+    # Score as a percentage, rounded half-up in integer arithmetic
+    score_pct = (matched_count * 200 + required_count) // (2 * required_count)
+    
+    recommendations = []
+    if len(skill_gaps) > 0:
+        recommendations.append(f"Consider learning: {', '.join(skill_gaps[:3])}")
+    recommendations.append(TIER_MESSAGES[(10 * matched_count > 7 * required_count) + (2 * matched_count > required_count)])
+    
+    return {
+        "match_score": score_pct / 100,
+        "matched_skills": matched,
+        "skill_gaps": skill_gaps,
+        "recommendations": recommendations
+    }
+
+def match_skills_batch(data):
+    internships = data.get('internships', [])
+    matched, required = count_skills_batch(
+        data.get('student_skills', []),
+        [internship.get('skills', []) for internship in internships]
+    )
+    # Same integer half-up rounding as match_skills
+    score_pct = (matched * 200 + required) // (2 * required)
+    return [
+        {"internship_id": internship.get('id'), "match_score": pct / 100}
+        for internship, pct in zip(internships, score_pct.tolist())
+    ]
@@ -0,0 +1,46 @@
+"""
+Copy skills.py next to every deployable that bundles it.
+
+Usage: python libs/skill-matching/sync.py [--check]
+
+With --check nothing is written and the exit status is 1 when a copy
+differs from the source.
+"""
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+SOURCE = os.path.join(ROOT, "libs", "skill-matching", "skills.py")
+COPIES = (
+    os.path.join(ROOT, "api", "ai", "_skills.py"),
+    os.path.join(ROOT, "apps", "web-app", "api", "ai", "_skills.py"),
+    os.path.join(ROOT, "apps", "ai-engine", "skills.py"),
+)
+
+def stale_copies(source: str):
+    stale = []
+    for path in COPIES:
+        try:
+            with open(path) as f:
+                if f.read() == source:
+                    continue
+        except FileNotFoundError:
+            pass
+        stale.append(path)
+    return stale
+
+def main(check: bool) -> int:
+    with open(SOURCE) as f:
+        source = f.read()
+    stale = stale_copies(source)
+    for path in stale:
+        if check:
+            print(f"{os.path.relpath(path, ROOT)} is out of date, run libs/skill-matching/sync.py")
+        else:
+            with open(path, "w") as f:
+                f.write(source)
+            print(f"Wrote {os.path.relpath(path, ROOT)}")
+    return 1 if check and stale else 0
+
+if __name__ == "__main__":
+    sys.exit(main("--check" in sys.argv[1:]))